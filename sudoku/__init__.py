@@ -11,6 +11,7 @@ from sudoku.sample_puzzles import (
     get_puzzle_by_name,
 )
 from sudoku.solver import (
+    BitmaskSolver,
     BruteForceSolver,
     ConstraintBasedSolver,
     DLXSolver,
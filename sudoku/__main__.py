@@ -19,7 +19,7 @@ from sudoku import (
     get_puzzle_by_name,
     get_solver,
 )
-from sudoku.ui import SudokuApp
+from sudoku.ui_defaults import DEFAULT_STEP_DELAY_MILLIS
 from sudoku.utils.colorize import (
     bold,
     green,
@@ -42,9 +42,17 @@ class SudokuMain:
         'brute-force': SolutionAlgorithm.BRUTE_FORCE,
         'constraint': SolutionAlgorithm.CONSTRAINT_BASED,
         'dlx': SolutionAlgorithm.DANCING_LINKS,
+        'bitmask': SolutionAlgorithm.BITMASK,
     }
 
-    DEFAULT_DELAY_MILLIS = SudokuApp.DEFAULT_STEP_DELAY_MILLIS
+    NON_GUI_ALGORITHMS = {
+        SolutionAlgorithm.DANCING_LINKS: 'DLX',
+        SolutionAlgorithm.BITMASK: 'bitmask',
+    }
+
+    POSSIBILITIES_PER_DOT = 1000
+
+    DEFAULT_DELAY_MILLIS = DEFAULT_STEP_DELAY_MILLIS
 
     def __init__(self, args: List[AnyStr] = None) -> None:
         """Initialize a SudokuMain with the given arguments."""
@@ -54,9 +62,12 @@ class SudokuMain:
         self.sudoku = parsed_args.sudoku
         self.name = parsed_args.name
         self.algorithm = self.ALGORITHM_CHOICES[parsed_args.algorithm]
+        self.sudoku_type = self.algorithm.value.sudoku_type
         self.gui = parsed_args.gui
         self.delay = parsed_args.delay
         self.quietude = parsed_args.quiet
+        self.dots_printed = 0
+        self.next_dot_at = self.POSSIBILITIES_PER_DOT
 
     @classmethod
     def parse_args(cls, args: List[AnyStr]) -> argparse.Namespace:
@@ -70,7 +81,8 @@ class SudokuMain:
                             choices=sorted(cls.ALGORITHM_CHOICES.keys()), default='constraint',
                             help='The algorithm to use to solve the puzzle')
         parser.add_argument('-g', '--gui', '--ui', action='store_true',
-                            help='Display a GUI showing the puzzle being solved (not available for DLX mode)')
+                            help='Display a GUI showing the puzzle being solved '
+                                 '(not available for DLX or bitmask mode)')
         parser.add_argument('-d', '--delay', '--delay-millis', type=int, default=cls.DEFAULT_DELAY_MILLIS,
                             help='How long to delay between steps in solving the puzzle (only applies in GUI mode)')
         parser.add_argument('-q', '--quiet', action='count', default=0,
@@ -119,12 +131,14 @@ class SudokuMain:
             except InvalidPuzzleError as error:
                 self.die(str(error))
 
-        return self.algorithm.value.sudoku_type.from_string(self.sudoku)
+        return self.sudoku_type.from_string(self.sudoku)
 
     def run_gui(self, sudoku: Sudoku) -> None:
         """Launch a graphical solver window."""
-        if self.algorithm == SolutionAlgorithm.DANCING_LINKS:
-            self.warn(yellow('GUI mode is not available for DLX algorithm. Defaulting to non-GUI mode...'),
+        if self.algorithm in self.NON_GUI_ALGORITHMS:
+            algorithm_name = self.NON_GUI_ALGORITHMS[self.algorithm]
+            self.warn(yellow(f'GUI mode is not available for {algorithm_name} algorithm. '
+                             f'Defaulting to non-GUI mode...'),
                       file=sys.stderr)
             self.gui = False
             self.name = None
@@ -135,30 +149,36 @@ class SudokuMain:
                              f'Defaulting to {self.DEFAULT_DELAY_MILLIS} ms...'),
                       file=sys.stderr)
             self.delay = self.DEFAULT_DELAY_MILLIS
+        # import the GUI (and tkinter) only when it's needed, so command line runs don't pay for it
+        from sudoku.ui import SudokuApp
         app = SudokuApp(sudoku=sudoku, algorithm=self.algorithm, delay_millis=self.delay)
         app.run()
 
     def cli_event_listener(self, solver: SudokuSolver, _: Sudoku) -> None:
         """Event listener used when running in command line (non-GUI) mode."""
-        _, remainder = divmod(solver.possibilities_tried, 1000)
-        if remainder == 0:
-            self.info('.', end='', flush=True)
+        if solver.possibilities_tried >= self.next_dot_at:
+            self.next_dot_at += self.POSSIBILITIES_PER_DOT
+            # only flush every 10th dot, to save on writes to the console
+            self.dots_printed += 1
+            self.info('.', end='', flush=self.dots_printed % 10 == 0)
 
     def run_cli(self, sudoku: Sudoku) -> None:
         """Solve the puzzle and print output to the console."""
         self.trace('Starting puzzle:')
         self.trace(sudoku.to_string(show_initial_state=True))
 
-        num_empty_cells = Sudoku.GRID_SIZE - len(sudoku.clue_cells)
+        num_empty_cells = sudoku.num_empty_cells
         algorithm_name = self.algorithm.name.lower().replace('_', ' ')
         self.info(f'Solving for {bold(num_empty_cells)} unknown cells '
                   f'using the {bold(algorithm_name)} algorithm...', end='', flush=True)
 
         solver = get_solver(sudoku=sudoku, algorithm=self.algorithm)
         solver.event_listener = functools.partial(self.cli_event_listener, solver)
-        start_time = time.time()
+        # the listener only prints a dot every so often, so it doesn't need to hear about every single step
+        solver.event_interval = self.POSSIBILITIES_PER_DOT // 10
+        start_time = time.perf_counter()
         solved = solver.solve()
-        end_time = time.time()
+        end_time = time.perf_counter()
         self.info('')   # force a newline after the dots
 
         if solved is None:
@@ -0,0 +1,69 @@
+"""Solve a batch of sudoku puzzles read from standard input, one puzzle per line."""
+
+import argparse
+import functools
+import multiprocessing
+import sys
+
+from typing import (
+    AnyStr,
+    Iterable,
+    List,
+)
+
+from sudoku.solver import (
+    SolutionAlgorithm,
+    get_solver,
+)
+
+
+ALGORITHM_CHOICES = {algorithm.short_name: algorithm for algorithm in SolutionAlgorithm}
+
+
+def solve_line(line: AnyStr, algorithm: SolutionAlgorithm) -> AnyStr:
+    """Solve the puzzle represented by the given line, returning the solution's condensed string (or '' if none)."""
+    try:
+        sudoku = algorithm.value.sudoku_type.from_string(line)
+        solved = get_solver(sudoku, algorithm).solve()
+    except ValueError:
+        # a malformed line, or (for DLX) a search that couldn't be turned back into a valid grid
+        return ''
+    if solved is None:
+        return ''
+    return solved.get_condensed_string()
+
+
+def solve_lines(lines: Iterable[AnyStr], algorithm: SolutionAlgorithm, jobs: int = 1) -> Iterable[AnyStr]:
+    """Generator that yields the solution to each puzzle in the given lines, in order, using the given job count."""
+    solve = functools.partial(solve_line, algorithm=algorithm)
+    if jobs <= 1:
+        yield from map(solve, lines)
+        return
+    with multiprocessing.Pool(processes=jobs) as pool:
+        yield from pool.imap(solve, lines, chunksize=16)
+
+
+def parse_args(args: List[AnyStr]) -> argparse.Namespace:
+    """Return a Namespace containing the batch configuration as parsed from the given arguments."""
+    parser = argparse.ArgumentParser(description='Solve sudoku puzzles read from standard input, one per line. '
+                                                 'Each solution is printed on its own line (or a blank line if the '
+                                                 'puzzle is invalid or has no solution).')
+    parser.add_argument('-a', '--algorithm', choices=sorted(ALGORITHM_CHOICES.keys()), default='constraint',
+                        help='The algorithm to use to solve the puzzles')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='How many worker processes to solve puzzles with')
+    return parser.parse_args(args)
+
+
+def main(args: List[AnyStr] = None) -> None:
+    """Entry point for batch solving."""
+    if args is None:
+        args = sys.argv[1:]
+    parsed_args = parse_args(args)
+    lines = (line.strip() for line in sys.stdin if line.strip())
+    for solution in solve_lines(lines, ALGORITHM_CHOICES[parsed_args.algorithm], parsed_args.jobs):
+        print(solution)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Implementation of a depth-first sudoku search that tracks each unit's used values as a bitmask.
+
+The search uses MatrixSudoku's unit numbering (CELL_UNITS) and its most-constrained-cell scan, but keeps only the
+27 unit masks rather than MatrixSudoku's per-value counts: it never places a value that a unit already holds, so a
+value's bit can simply be toggled off again on backtracking, and a plain list of ints is cheaper to update.
+"""
+
+from typing import (
+    Any,
+    Callable,
+    List,
+    Optional,
+)
+
+from sudoku.grid import (
+    CELL_UNITS,
+    most_constrained_cell,
+)
+from sudoku.utils.event import EventDispatcher
+
+
+class BitmaskSearch(EventDispatcher[Any]):
+    """Class representing the state of a bitmask-based sudoku search."""
+
+    def __init__(self, board: List[int], event_listener: Optional[Callable[[Any], None]] = None) -> None:
+        """Initialize a BitmaskSearch with the given board (81 values in row-major order, with 0 for empty cells)."""
+        super().__init__(event_listener=event_listener)
+        self.board = list(board)
+        self.unit_masks = [0] * 27
+        self.possibilities_tried = 0
+        self.backtracks = 0
+        self.valid = self._initialize()
+
+    def _initialize(self) -> bool:
+        """Initialize the unit masks from the board, returning False if any clues conflict."""
+        unit_masks = self.unit_masks
+        for index, value in enumerate(self.board):
+            if value:
+                bit = 1 << (value - 1)
+                row, column, box = CELL_UNITS[index]
+                if (unit_masks[row] | unit_masks[column] | unit_masks[box]) & bit:
+                    return False
+                unit_masks[row] |= bit
+                unit_masks[column] |= bit
+                unit_masks[box] |= bit
+        return True
+
+    def search(self) -> Optional[List[int]]:
+        """Perform the search, returning the solved board (or None if the board has no solution)."""
+        if not self.valid:
+            return None
+        if self._search():
+            return list(self.board)
+        return None
+
+    def _search(self) -> bool:
+        """Fill in the empty cell with the fewest candidates, recursing on each candidate in turn."""
+        board, unit_masks = self.board, self.unit_masks
+        index, candidates = most_constrained_cell(board, unit_masks)
+        if index < 0:
+            return True
+
+        if self.event_listener is not None:
+            self.on_state_changed(None)
+        row, column, box = CELL_UNITS[index]
+        while candidates:
+            bit = candidates & -candidates
+            candidates ^= bit
+            self.possibilities_tried += 1
+            board[index] = bit.bit_length()
+            unit_masks[row] |= bit
+            unit_masks[column] |= bit
+            unit_masks[box] |= bit
+            if self._search():
+                return True
+            unit_masks[row] ^= bit
+            unit_masks[column] ^= bit
+            unit_masks[box] ^= bit
+        board[index] = 0
+        self.backtracks += 1
+        return False
@@ -1,11 +1,5 @@
 """Implementation of the dancing links (DLX) algorithm for the exact cover problem, due to Don Knuth."""
 
-import uuid
-
-from dataclasses import (
-    dataclass,
-    field,
-)
 from typing import (
     Any,
     AnyStr,
@@ -13,217 +7,201 @@ from typing import (
     Iterable,
     List,
     Optional,
-    Union,
+    Sequence,
 )
 
 from sudoku.utils.event import EventDispatcher
 
 
-@dataclass(eq=False, repr=False)
-class Node:
-    """A node in the sparse matrix used by DLX."""
-    column: 'Column'
-    left: Optional['Node'] = None
-    right: Optional['Node'] = None
-    up: Optional[Union['Column', 'Node']] = None
-    down: Optional[Union['Column', 'Node']] = None
-    id: uuid.UUID = field(hash=True, init=False, default_factory=uuid.uuid4)
-
-    def __eq__(self, other: Any) -> bool:
-        """Return True IFF the other object is equal to this object."""
-        if not isinstance(other, (Column, Node)):
-            return False
-        return other.id == self.id
-
-
-@dataclass(eq=False, repr=False)
-class Column:
-    """A column header in the sparse matrix used by DLX."""
-    left: Optional['Column'] = None
-    right: Optional['Column'] = None
-    up: Optional[Node] = None
-    down: Optional[Node] = None
-    name: Optional[AnyStr] = None
-    size: int = 0
-    id: uuid.UUID = field(hash=True, init=False, default_factory=uuid.uuid4)
-
-    @property
-    def column(self) -> 'Column':
-        """Property that returns the current column's column (itself)."""
-        return self
-
-    def __eq__(self, other: Any) -> bool:
-        """Return True IFF the other object is equal to this object."""
-        if not isinstance(other, (Column, Node)):
-            return False
-        return other.id == self.id
-
-    def __lt__(self, other: Any) -> bool:
-        """Return True IFF the other column is less than this column (based on size)."""
-        if not isinstance(other, Column):
-            raise TypeError(f'Expected argument of type {self.__class__.__name__} for < comparison')
-        return (self.size, self.name, self.id) < (other.size, other.name, other.id)
-
-    def __hash__(self) -> int:
-        """Return a hash of this column."""
-        return hash(self.id)
-
-    def __repr__(self) -> AnyStr:
-        """Return a string representation of this column."""
-        return f'Column({self.name})'
-
-
 class DLX(EventDispatcher[Any]):
     """Class representing the sparse matrix of DLX."""
 
+    ROOT = 0
+
     def __init__(self, matrix: List[List[int]], column_names: Optional[List[AnyStr]] = None,
                  minimize_branching: bool = False, event_listener: Optional[Callable[[Any], None]] = None) -> None:
         """Initialize a DLX instance with the given matrix and column names, and optionally minimizing branching."""
         super().__init__(event_listener=event_listener)
-        self.root = Column(name='root')
-        self.solution = {}
+        # following Knuth, the matrix is stored as parallel lists indexed by node: L, R, U, and D link each node to its
+        # neighbors, C maps each node to its column header, and S holds the size of each column; node 0 is the root,
+        # and nodes 1 through n are the headers of the n columns (whose names are kept in the names list)
+        self.names = ['root']
+        self.L = [self.ROOT]
+        self.R = [self.ROOT]
+        self.U = [self.ROOT]
+        self.D = [self.ROOT]
+        self.C = [self.ROOT]
+        self.S = [0]
+        self.solution = []
         self.minimize_branching = minimize_branching
         self.possibilities_tried = 0
         self.backtracks = 0
         self._initialize(matrix, column_names)
 
+    @classmethod
+    def from_sparse(cls, rows: Sequence[Sequence[int]], num_columns: int, column_names: Optional[List[AnyStr]] = None,
+                    minimize_branching: bool = False,
+                    event_listener: Optional[Callable[[Any], None]] = None) -> 'DLX':
+        """Create a DLX instance from a sparse matrix, given as the (zero-based) column indices of each row's 1s."""
+        dlx = cls([], minimize_branching=minimize_branching, event_listener=event_listener)
+        dlx._initialize_sparse(rows, num_columns, column_names)
+        return dlx
+
     def _initialize(self, matrix: List[List[int]], column_names: Optional[Iterable[AnyStr]] = None) -> None:
         """Initialize the data structures used by DLX from the given matrix and column names."""
         if not matrix:
             return
+        rows = [[index for index, value in enumerate(row) if value == 1] for row in matrix]
+        self._initialize_sparse(rows, len(matrix[0]), column_names)
 
+    def _initialize_sparse(self, rows: Sequence[Sequence[int]], num_columns: int,
+                           column_names: Optional[Iterable[AnyStr]] = None) -> None:
+        """Initialize the data structures used by DLX from the given sparse matrix and column names."""
         if column_names is None:
-            num_columns = len(matrix[0])
             if num_columns <= 26:
                 column_names = (chr(ord('A') + i) for i in range(num_columns))
             else:
                 column_names = (str(i + 1) for i in range(num_columns))
 
-        # create the column list headers
-        prev_column = self.root
-        for column_name in column_names:
-            column = Column(name=column_name, left=prev_column)
-            prev_column.right = column
-            prev_column = column
-        prev_column.right = self.root
-        self.root.left = prev_column
-
-        # create the nodes
-        prev_row_nodes = {column: column for column in self.traverse_right(self.root)}
-        for i, row in enumerate(matrix):
-            node = None
-            prev_col_node = None
-            for column, value in zip(self.traverse_right(self.root), row):
-                if value == 1:
-                    node = Node(column)
-                    prev_row_node = prev_row_nodes[column]
-                    node.up = prev_row_node
-                    prev_row_node.down = node
-                    prev_row_nodes[column] = node
-                    if prev_col_node is not None:
-                        node.left = prev_col_node
-                        prev_col_node.right = node
-                    prev_col_node = node
-            if node is not None:
-                if node.left is None:
-                    first = node
-                else:
-                    first = node.left
-                    while first.left is not None:
-                        first = first.left
-                node.right = first
-                first.left = node
-
-        for column, node in prev_row_nodes.items():
-            node.down = column
-            column.up = node
-
-    def search(self, k: int = 0) -> Optional[List[List[AnyStr]]]:
-        """Perform the recursive search, returning a list of lists of columns that solve the exact cover problem."""
-        if self.root.right == self.root:
-            return self.get_solution()
-        column = self.get_next_column()
-        self.cover(column)
-        self.possibilities_tried += 1
-        self.on_state_changed(None)
-        for row in self.traverse_down(column):
-            self.solution[k] = row
-            for next_column in self.traverse_right(row):
-                self.cover(next_column.column)
-            result = self.search(k + 1)
-            if result:
-                return result
-            row = self.solution[k]
-            column = row.column
-            for prev_column in self.traverse_left(row):
-                self.uncover(prev_column.column)
-        self.uncover(column)
-        self.backtracks += 1
-        return None
-
-    def cover(self, column: Column) -> None:
+        # create the column list headers, with room after them for one node per 1 in the matrix
+        self.names.extend(column_names)
+        num_headers = num_columns + 1
+        num_nodes = num_headers + sum(len(row) for row in rows)
+        L, R, U, D, C = [0] * num_nodes, [0] * num_nodes, [0] * num_nodes, [0] * num_nodes, [0] * num_nodes
+        S = [0] * num_headers
+        L[:num_headers] = [num_columns] + list(range(num_columns))
+        R[:num_headers] = list(range(1, num_headers)) + [self.ROOT]
+        U[:num_headers] = D[:num_headers] = C[:num_headers] = range(num_headers)
+
+        # create the nodes, appending each one to the bottom of its column, then closing each row into a ring
+        node = num_headers
+        for row in rows:
+            if not row:
+                continue
+            first = node
+            for index in row:
+                column = index + 1
+                C[node] = column
+                S[column] += 1
+                U[node] = U[column]
+                D[node] = column
+                D[U[column]] = node
+                U[column] = node
+                L[node] = node - 1
+                R[node] = node + 1
+                node += 1
+            L[first] = node - 1
+            R[node - 1] = first
+
+        # relink the column headers from smallest to largest, so the search starts out on the tightest constraints
+        # even when it isn't minimizing branching (the sort is stable, so equal-sized columns keep their order)
+        order = [self.ROOT] + sorted(range(1, num_headers), key=S.__getitem__)
+        for left, right in zip(order, order[1:] + [self.ROOT]):
+            R[left] = right
+            L[right] = left
+        self.L, self.R, self.U, self.D, self.C, self.S = L, R, U, D, C, S
+
+    def search(self) -> Optional[List[List[AnyStr]]]:
+        """Perform the search, returning a list of lists of columns that solve the exact cover problem."""
+        L, R, D, C = self.L, self.R, self.D, self.C
+        cover, uncover = self.cover, self.uncover
+        # the rows chosen so far form an explicit stack (in place of recursion); the column chosen at each level is
+        # always the column of the row chosen at that level, so it doesn't need a stack of its own
+        rows = self.solution = []
+        while R[self.ROOT] != self.ROOT:
+            column = self.get_next_column()
+            cover(column)
+            self.possibilities_tried += 1
+            if self.event_listener is not None:
+                self.on_state_changed(None)
+            row = D[column]
+            while row == column:
+                # every row in this column has been tried, so backtrack to the next row at the previous level
+                uncover(column)
+                self.backtracks += 1
+                if not rows:
+                    return None
+                row = rows.pop()
+                column = C[row]
+                node = L[row]
+                while node != row:
+                    uncover(C[node])
+                    node = L[node]
+                row = D[row]
+            rows.append(row)
+            node = R[row]
+            while node != row:
+                cover(C[node])
+                node = R[node]
+        solution = self.get_solution()
+
+        # uncover everything covered along the way, leaving the matrix as it was so it can be searched again
+        for row in reversed(rows):
+            node = L[row]
+            while node != row:
+                uncover(C[node])
+                node = L[node]
+            uncover(C[row])
+        return solution
+
+    def cover(self, column: int) -> None:
         """'Cover' the given column as defined by the DLX algorithm."""
-        column.right.left = column.left
-        column.left.right = column.right
-        for row in self.traverse_down(column):
-            for next_column in self.traverse_right(row):
-                next_column.down.up = next_column.up
-                next_column.up.down = next_column.down
-                if self.minimize_branching:
-                    next_column.column.size -= 1
-
-    def uncover(self, column: Column) -> None:
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        L[R[column]] = L[column]
+        R[L[column]] = R[column]
+        row = D[column]
+        while row != column:
+            node = R[row]
+            while node != row:
+                U[D[node]] = U[node]
+                D[U[node]] = D[node]
+                S[C[node]] -= 1
+                node = R[node]
+            row = D[row]
+
+    def uncover(self, column: int) -> None:
         """'Uncover' the given column as defined by the DLX algorithm."""
-        for row in self.traverse_up(column):
-            for prev_column in self.traverse_left(row):
-                if self.minimize_branching:
-                    prev_column.column.size += 1
-                prev_column.down.up = prev_column
-                prev_column.up.down = prev_column
-        column.right.left = column
-        column.left.right = column
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        row = U[column]
+        while row != column:
+            node = L[row]
+            while node != row:
+                S[C[node]] += 1
+                U[D[node]] = node
+                D[U[node]] = node
+                node = L[node]
+            row = U[row]
+        L[R[column]] = column
+        R[L[column]] = column
 
     def get_solution(self) -> List[List[AnyStr]]:
         """Return a list of lists of columns representing the solution to the exact cover problem."""
+        names, R, C = self.names, self.R, self.C
         solution = []
-        for node in self.solution.values():
-            columns = [node.column.name]
-            columns.extend(next_node.column.name for next_node in self.traverse_right(node))
+        for row in self.solution:
+            columns = [names[C[row]]]
+            node = R[row]
+            while node != row:
+                columns.append(names[C[node]])
+                node = R[node]
             solution.append(columns)
         return solution
 
-    def get_next_column(self) -> Column:
+    def get_next_column(self) -> int:
         """Return the next column to be considered by the DLX algorithm."""
         if self.minimize_branching:
-            return min(self.traverse_right(self.root))
-        return self.root.right
-
-    @classmethod
-    def traverse_left(cls, node: Union[Column, Node]) -> Iterable[Union[Column, Node]]:
-        """Traverse a linked list to the left from the given node."""
-        yield from cls._traverse(node, 'left')
-
-    @classmethod
-    def traverse_right(cls, node: Union[Column, Node]) -> Iterable[Union[Column, Node]]:
-        """Traverse a linked list to the right from the given node."""
-        yield from cls._traverse(node, 'right')
-
-    @classmethod
-    def traverse_up(cls, node: Union[Column, Node]) -> Iterable[Union[Column, Node]]:
-        """Traverse a linked list up from the given node."""
-        yield from cls._traverse(node, 'up')
-
-    @classmethod
-    def traverse_down(cls, node: Union[Column, Node]) -> Iterable[Union[Column, Node]]:
-        """Traverse a linked list down from the given node."""
-        yield from cls._traverse(node, 'down')
-
-    @staticmethod
-    def _traverse(node: Union[Column, Node], direction: AnyStr) -> Iterable[Union[Column, Node]]:
-        next_node = getattr(node, direction)
-        while next_node != node:
-            yield next_node
-            next_node = getattr(next_node, direction)
+            R, S = self.R, self.S
+            best_column = column = R[self.ROOT]
+            best_size = S[best_column]
+            # stop scanning once a column with at most one row turns up: it's a dead end or a forced choice either way
+            while column != self.ROOT and best_size > 1:
+                size = S[column]
+                if size < best_size:
+                    best_column = column
+                    best_size = size
+                column = R[column]
+            return best_column
+        return self.R[self.ROOT]
 
 
 if __name__ == '__main__':
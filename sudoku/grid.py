@@ -2,15 +2,16 @@ import abc
 import itertools
 import re
 
-from collections import defaultdict
+from collections import deque
 from dataclasses import dataclass
 from enum import Enum
 from typing import (
     AnyStr,
-    Dict,
+    Deque,
     Iterable,
     List,
     Optional,
+    Sequence,
     Set,
     Tuple,
     Union,
@@ -33,19 +34,33 @@ class Row(Enum):
 
     def next(self, wrap: bool = True) -> 'Row':
         """Return the row after the current row."""
-        if self == Row.I:
-            if wrap:
-                return Row.A
+        if self is Row.I and not wrap:
             raise ValueError(f'{str(self)} has no next row')
-        return Row[chr(ord(self.name) + 1)]
+        return NEXT_ROWS[self]
+
+
+NEXT_ROWS = {row: Row(row.value % 9 + 1) for row in Row}
+ROW_OFFSETS = {row: (row.value - 1) * 9 for row in Row}  # the index of each row's first cell, in row-major order
+
+# the row and column of each cell, by the cell's index in row-major order
+CELL_ROWS = [row for row in Row for _ in range(9)]
+CELL_COLUMNS = [column for _ in Row for column in range(1, 10)]
 
 
 @dataclass(unsafe_hash=True)
 class Cell:
     """Class representing a single cell in a sudoku puzzle."""
+    __slots__ = ('row', 'column', 'value')
     row: Row
     column: int
-    value: Optional[int] = None
+    value: Optional[int]
+
+    def __init__(self, row: Row, column: int, value: Optional[int] = None) -> None:
+        """Initialize a Cell with the given row and column, and optionally a value."""
+        # defined by hand because a field default would be a class attribute, which __slots__ doesn't allow
+        self.row = row
+        self.column = column
+        self.value = value
 
     @property
     def name(self) -> AnyStr:
@@ -65,6 +80,21 @@ def columns() -> Iterable[int]:
     return range(1, 10)
 
 
+# the row, column, and box (each numbered 0-8) containing each cell, by the cell's index in row-major order
+ROW_INDICES = [index // 9 for index in range(81)]
+COLUMN_INDICES = [index % 9 for index in range(81)]
+BOX_INDICES = [(index // 27) * 3 + (index % 9) // 3 for index in range(81)]
+BOX_CELLS = [tuple(index for index in range(81) if BOX_INDICES[index] == box) for box in range(9)]
+
+# the three units containing each cell, numbered 0-26: rows are units 0-8, columns 9-17, and boxes 18-26
+CELL_UNITS = [(ROW_INDICES[index], 9 + COLUMN_INDICES[index], 18 + BOX_INDICES[index]) for index in range(81)]
+UNIT_CELLS = [tuple(index for index in range(81) if unit in CELL_UNITS[index]) for unit in range(27)]
+
+# maps each cell value byte (0 for empty) to the character that represents it in a condensed string, and back
+CONDENSED_VALUE_TABLE = bytes.maketrans(bytes(range(10)), b'.123456789')
+DIGIT_VALUE_TABLE = bytes.maketrans(b'.0123456789', bytes([0]) + bytes(range(10)))
+
+
 class Sudoku(abc.ABC):
     """Abstract base class for a sudoku puzzle."""
 
@@ -75,37 +105,33 @@ class Sudoku(abc.ABC):
 
     def __init__(self) -> None:
         """Initialize a Sudoku."""
-        self.clue_cells = set()
+        self.clue_cells = set()  # the indices of the clue cells, in row-major order
 
     def __str__(self) -> AnyStr:
         """Return a string representation of the sudoku suitable for printing to the console."""
         return self.to_string()
 
+    @property
+    def num_empty_cells(self) -> int:
+        """Property that returns the number of cells in the puzzle that are not clue cells."""
+        return self.GRID_SIZE - len(self.clue_cells)
+
+    @property
+    def clue_cells_as_cells(self) -> Set[Cell]:
+        """Property that returns the clue cells as Cell objects (with no values)."""
+        return {Cell(CELL_ROWS[index], CELL_COLUMNS[index]) for index in self.clue_cells}
+
     @classmethod
     def from_string(cls, string: AnyStr) -> 'Sudoku':
         """Create a Sudoku instance from a string (see http://norvig.com/sudoku.html)."""
-        sudoku = cls()
-        row = Row.A
-        column = 1
-        cell_count = 0
-        for char in string:
-            values = None
-            if char in '123456789':
-                values = (row, column, int(char))
-                sudoku.clue_cells.add(Cell(*values))
-            elif char in '0.':
-                values = (row, column, None)
-            if values is not None:
-                sudoku.set_cell_value(*values)
-                cell_count += 1
-                if divmod(cell_count, cls.GRID_SIDE_LENGTH)[1] == 0:
-                    row = row.next()
-                    column = 1
-                else:
-                    column += 1
-
-        if cell_count != cls.GRID_SIZE:
+        digits = cls.NON_DIGIT_REGEX.sub('', string)
+        if len(digits) != cls.GRID_SIZE:
             raise ValueError('Invalid sudoku string')
+        sudoku = cls()
+        for index, value in enumerate(digits.encode('ascii').translate(DIGIT_VALUE_TABLE)):
+            if value:
+                sudoku.clue_cells.add(index)
+                sudoku.set_cell_value(CELL_ROWS[index], CELL_COLUMNS[index], value)
         return sudoku
 
     def to_string(self, colorize: bool = True, show_initial_state: bool = False) -> AnyStr:
@@ -116,7 +142,7 @@ class Sudoku(abc.ABC):
             row_str = '|'
             for column in columns():
                 cell_value = self.get_cell_value(row, column) or '.'
-                if any(cell.row == row and cell.column == column for cell in self.clue_cells):
+                if ROW_OFFSETS[row] + column - 1 in self.clue_cells:
                     if colorize:
                         cell_value = cyan(cell_value)
                 elif show_initial_state and cell_value != '.':
@@ -126,14 +152,14 @@ class Sudoku(abc.ABC):
                     row_str += ' |'
             row_str += ' |\n'
             text += row_str
-            if row in {Row.C, Row.F}:
+            if row.value in {3, 6}:
                 text += horizontal_line
         text += horizontal_line
         return text
 
     def get_condensed_string(self) -> AnyStr:
         """Return a condensed string representation of the sudoku (cell values only, no formatting)."""
-        return self.NON_DIGIT_REGEX.sub('', self.to_string(colorize=False))
+        return ''.join(str(self.get_cell_value(row, column) or '.') for row in Row for column in columns())
 
     @abc.abstractmethod
     def get_cell_value(self, row: Row, column: int) -> Optional[int]:
@@ -158,107 +184,143 @@ class Sudoku(abc.ABC):
 
 @dataclass
 class MatrixSudoku(Sudoku):
-    """Sudoku subclass representing a sudoku puzzle as a 2D matrix of cells."""
-    cells: List[List[Cell]]
+    """Sudoku subclass representing a sudoku puzzle as a flat array of cell values in row-major order (0 if empty)."""
+    values: bytearray
 
     def __init__(self, cells: List[List[Cell]] = None) -> None:
         """Initialize a MatrixSudoku, optionally with a matrix of cells."""
         super().__init__()
-        if cells is None:
-            cells = [
-                [
-                    Cell(row, column)
-                    for column in columns()
-                ]
-                for row in Row
-            ]
-        else:
-            self.clue_cells |= {cell for cell in all_cells()
-                                if cells[cell.row.value - 1][cell.column - 1].value is not None}
-        self.cells = cells
+        self.values = bytearray(self.GRID_SIZE)
+        # the values in each unit are tracked as cells change, so the grid's validity is always known: unit_counts
+        # holds how many cells in each unit (0-26) have each value (at index unit * 10 + value), unit_masks holds
+        # the values present in each unit as a bitmask, and conflicts counts the pairs of cells sharing a unit and
+        # a value; filled_cells counts the non-empty cells
+        self.unit_counts = [0] * 270
+        self.unit_masks = [0] * 27
+        self.conflicts = 0
+        self.filled_cells = 0
+        if cells is not None:
+            for index, cell in enumerate(itertools.chain(*cells)):
+                if cell.value is not None:
+                    self.set_index_value(index, cell.value)
+                    self.clue_cells.add(index)
 
-    def __getitem__(self, item: Union[Cell, Tuple[Row, int]]) -> Optional[int]:
-        """Allow accessing the value of a given cell with `sudoku[row, column]` or `sudoku[cell]`."""
+    @staticmethod
+    def index(item: Union[Cell, Tuple[Row, int]]) -> int:
+        """Return the index in the values array of the given cell or (row, column) pair."""
         if isinstance(item, tuple):
             row, column = item
         else:
             row, column = item.row, item.column
-        return self.cells[row.value - 1][column - 1].value
+        return ROW_OFFSETS[row] + column - 1
+
+    def __getitem__(self, item: Union[Cell, Tuple[Row, int]]) -> Optional[int]:
+        """Allow accessing the value of a given cell with `sudoku[row, column]` or `sudoku[cell]`."""
+        return self.values[self.index(item)] or None
 
     def __setitem__(self, item: Union[Cell, Tuple[Row, int]], value: Optional[int]) -> None:
         """Allow setting the value of a given cell with `sudoku[row, column] = value` or `sudoku[cell] = value`."""
-        if isinstance(item, tuple):
-            row, column = item
-        else:
-            row, column = item.row, item.column
-        self.cells[row.value - 1][column - 1].value = value
+        self.set_index_value(self.index(item), value)
 
     def __iter__(self) -> Iterable[Cell]:
         """Return an iterator that iterates over all cells in the sudoku grid."""
-        return itertools.chain(*self.cells)
+        return map(self.get_cell, range(self.GRID_SIZE))
+
+    def get_condensed_string(self) -> AnyStr:
+        """Return a condensed string representation of the sudoku (cell values only, no formatting)."""
+        return self.values.translate(CONDENSED_VALUE_TABLE).decode('ascii')
+
+    def get_cell(self, index: int) -> Cell:
+        """Return a new Cell holding the current value of the cell at the given index in the values array."""
+        return Cell(CELL_ROWS[index], CELL_COLUMNS[index], self.values[index] or None)
 
     @property
     def rows(self) -> List[List[Cell]]:
-        """Property for accessing the rows in the sudoku grid."""
-        return self.cells
+        """Property for accessing the rows in the sudoku grid (as new Cells holding the current values)."""
+        return [self.get_row(row) for row in Row]
 
     @property
     def columns(self) -> List[List[Cell]]:
-        """Property for accessing the columns in the sudoku grid."""
-        return list(list(col) for col in zip(*self.cells))
+        """Property for accessing the columns in the sudoku grid (as new Cells holding the current values)."""
+        return [self.get_column(column) for column in columns()]
 
     @property
     def boxes(self) -> List[List[Cell]]:
-        """Property for accessing the 3x3 boxes in the sudoku grid."""
-        return [
-            [
-                self.cells[row + i][col + j]
-                for i in range(3)
-                for j in range(3)
-            ]
-            for col in range(0, 9, 3)
-            for row in range(0, 9, 3)
-        ]
+        """Property for accessing the 3x3 boxes in the sudoku grid (as new Cells holding the current values)."""
+        return [self.get_box(box_num) for box_num in range(1, 10)]
 
     def get_row(self, row: Row) -> List[Cell]:
         """Return a list of cells representing the given row."""
-        return self.cells[row.value - 1]
+        start = ROW_OFFSETS[row]
+        return [self.get_cell(index) for index in range(start, start + 9)]
 
     def get_column(self, column: int) -> List[Cell]:
         """Return a list of cells representing the given column."""
-        return self.columns[column - 1]
+        return [self.get_cell(index) for index in range(column - 1, self.GRID_SIZE, 9)]
 
     def get_box(self, box_num: int) -> List[Cell]:
         """Return a list of cells representing the given box."""
-        return self.boxes[box_num - 1]
+        # boxes are numbered down each column of boxes first: box 2 is below box 1, and box 4 is right of box 1
+        box = ((box_num - 1) % 3) * 3 + (box_num - 1) // 3
+        return [self.get_cell(index) for index in BOX_CELLS[box]]
 
     def get_next_empty_cell(self) -> Optional[Cell]:
         """Return the next cell that does not yet have a value (if any)."""
-        return next((cell for cell in self if cell.value is None), None)
+        index = self.values.find(0)
+        if index < 0:
+            return None
+        return self.get_cell(index)
 
     def get_cell_value(self, row: Row, column: int) -> Optional[int]:
         """Return the value of the sudoku grid at the given row and column."""
-        return self[row, column]
+        return self.values[ROW_OFFSETS[row] + column - 1] or None
 
     def set_cell_value(self, row: Row, column: int, value: Optional[int]) -> bool:
         """Set the value of the sudoku grid at the given row and column to the given value."""
-        self[row, column] = value
+        self.set_index_value(ROW_OFFSETS[row] + column - 1, value)
         return True
 
+    def set_index_value(self, index: int, value: Optional[int]) -> None:
+        """Set the value of the cell at the given index (in row-major order), updating the unit bookkeeping."""
+        value = value or 0
+        old_value = self.values[index]
+        if value == old_value:
+            return
+        if not 0 <= value <= 9:
+            raise ValueError(f'Invalid cell value: {value}')
+        self.values[index] = value
+        unit_counts, unit_masks = self.unit_counts, self.unit_masks
+        if not old_value:
+            self.filled_cells += 1
+        elif not value:
+            self.filled_cells -= 1
+        if old_value:
+            for unit in CELL_UNITS[index]:
+                key = unit * 10 + old_value
+                count = unit_counts[key] - 1
+                unit_counts[key] = count
+                self.conflicts -= count
+                if not count:
+                    unit_masks[unit] ^= 1 << (old_value - 1)
+        if value:
+            for unit in CELL_UNITS[index]:
+                key = unit * 10 + value
+                count = unit_counts[key]
+                unit_counts[key] = count + 1
+                self.conflicts += count
+                unit_masks[unit] |= 1 << (value - 1)
+
+    def get_most_constrained_cell(self) -> Tuple[int, int]:
+        """Return the index of the empty cell with the fewest candidates and its candidates (or -1 if none is empty)."""
+        return most_constrained_cell(self.values, self.unit_masks)
+
     def is_valid(self) -> bool:
         """Return True IFF the sudoku is valid (does not violate any rules)."""
-        if not all(cell.value is None or cell.value in self.CELL_VALUES for cell in self):
-            return False
-        for units in (self.rows, self.columns, self.boxes):
-            for unit in units:
-                unit_values = [cell.value for cell in unit if cell.value is not None]
-                if len(set(unit_values)) != len(unit_values):
-                    return False
-        return True
+        return not self.conflicts
 
     def is_solved(self) -> bool:
         """Return True IFF the sudoku is solved."""
-        return self.is_valid() and all(cell.value is not None for cell in self)
+        return not self.conflicts and self.filled_cells == self.GRID_SIZE
 
 
 def cross(a, b) -> List[AnyStr]:
@@ -283,71 +345,133 @@ PEERS = {
     for c in CELLS
 }
 
+# the same tables, with cells identified by their index in CELLS rather than by name
+CELL_INDICES = {c: index for index, c in enumerate(CELLS)}
+UNIT_INDICES = [tuple(tuple(CELL_INDICES[u] for u in unit) for unit in UNITS[c]) for c in CELLS]
+# for each position in a cell's UNIT_INDICES, the kinds of unit (0 row, 1 column, 2 box, as in CELL_UNITS) that can
+# share two or three of its cells: a box for a row or column, and a row or column for a box
+UNIT_KINDS = [next(kind for kind, unit in enumerate(CELL_UNITS[0]) if set(UNIT_CELLS[unit]) == set(cells))
+              for cells in UNIT_INDICES[0]]
+LOCKING_KINDS = [(0, 1) if kind == 2 else (2,) for kind in UNIT_KINDS]
+PEER_INDICES = [tuple(sorted(CELL_INDICES[p] for p in PEERS[c])) for c in CELLS]
+
+ALL_VALUES = 0x1FF  # candidate values as a bitmask: bit 0 is 1, bit 1 is 2, ..., bit 8 is 9
+POPCOUNT = [bin(mask).count('1') for mask in range(ALL_VALUES + 1)]
+MASK_VALUES = [tuple(v for v in range(1, 10) if mask & (1 << (v - 1))) for mask in range(ALL_VALUES + 1)]
+
+
+def most_constrained_cell(values: Sequence[int], unit_masks: Sequence[int]) -> Tuple[int, int]:
+    """Return the index of the empty cell with the fewest candidates and its candidates (or -1 if none is empty).
+
+    values holds the 81 cell values in row-major order (0 for empty) and unit_masks the values used by each of the
+    27 units numbered as in CELL_UNITS.
+    """
+    best_index, best_candidates, best_count = -1, 0, 10
+    for index in range(81):
+        if not values[index]:
+            row, column, box = CELL_UNITS[index]
+            candidates = ALL_VALUES & ~(unit_masks[row] | unit_masks[column] | unit_masks[box])
+            count = POPCOUNT[candidates]
+            if count < best_count:
+                best_index, best_candidates, best_count = index, candidates, count
+                if count <= 1:
+                    break
+    return best_index, best_candidates
+
 
 class DictSudoku(Sudoku):
-    """Sudoku subclass representing a sudoku puzzle as a dict."""
+    """Sudoku subclass representing a sudoku puzzle as a table of each cell's candidate values."""
 
-    def __init__(self, values: Dict[AnyStr, Set[int]] = None) -> None:
-        """Initialize a DictSudoku, optionally with a dict of initial values."""
+    def __init__(self, values: List[int] = None) -> None:
+        """Initialize a DictSudoku, optionally with a list of initial values (as bitmasks, in row-major order)."""
         super().__init__()
         if values is None:
-            values = defaultdict(lambda: Sudoku.CELL_VALUES.copy())
+            values = [ALL_VALUES] * self.GRID_SIZE
         else:
-            self.clue_cells |= {cell for cell in all_cells() if len(values.get(cell.name, set())) == 1}
+            self.clue_cells |= {index for index, mask in enumerate(values) if POPCOUNT[mask] == 1}
         self.values = values
 
     @staticmethod
-    def key(row: Row, column: int) -> AnyStr:
-        """Return the dict key for the given row and column."""
-        return f'{row.name}{column}'
+    def key(row: Row, column: int) -> int:
+        """Return the key into values (the index of the cell in CELLS) for the given row and column."""
+        return ROW_OFFSETS[row] + column - 1
 
     def get_cell_value(self, row: Row, column: int) -> Optional[int]:
         """Return the value of the sudoku grid at the given row and column."""
-        value = self.values[self.key(row, column)]
-        if len(value) == 1:
-            return list(value)[0]
+        mask = self.values[self.key(row, column)]
+        if POPCOUNT[mask] == 1:
+            return mask.bit_length()
         return None
 
     def set_cell_value(self, row: Row, column: int, value: Optional[int]) -> bool:
         """Set the value of the sudoku grid at the given row and column to the given value."""
         if value is not None:
-            other_values = self.values[self.key(row, column)] - {value}
-            if not all(self.eliminate(row, column, val) for val in other_values):
-                return False
+            return self.set_index_value(self.key(row, column), value)
         return True
 
+    def set_index_value(self, index: int, value: int) -> bool:
+        """Set the value of the cell at the given index (in row-major order) to the given value."""
+        other_values = MASK_VALUES[self.values[index] & ~(1 << (value - 1))]
+        return self._propagate(deque((index, val) for val in other_values))
+
     def eliminate(self, row: Row, column: int, value: int) -> bool:
         """Given a row, column, and value, eliminate possibilities from other cells that are no longer valid."""
-        key = self.key(row, column)
-        if value not in self.values[key]:
-            return True
-        self.values[key] = self.values[key] - {value}
-        if len(self.values[key]) == 0:
-            return False
-        if len(self.values[key]) == 1:
-            other_value = list(self.values[key])[0]
-            if not all(self.eliminate(Row[c[0]], int(c[1]), other_value) for c in PEERS[key]):
-                return False
-        for unit in UNITS[key]:
-            places = [c for c in unit if value in self.values[c]]
-            if len(places) == 0:
+        return self._propagate(deque([(self.key(row, column), value)]))
+
+    def _propagate(self, work: Deque[Tuple[int, int]]) -> bool:
+        """Perform the queued (key, value) eliminations and any they force, returning False on a contradiction."""
+        values = self.values
+        while work:
+            key, value = work.popleft()
+            bit = 1 << (value - 1)
+            mask = values[key]
+            if not mask & bit:
+                continue
+            mask ^= bit
+            values[key] = mask
+            if not mask:
                 return False
-            if len(places) == 1:
-                place = places[0]
-                if not self.set_cell_value(Row[place[0]], int(place[1]), value):
+            if POPCOUNT[mask] == 1:
+                # the cell's last remaining value can't be used by any of its peers
+                work.extend((peer, mask.bit_length()) for peer in PEER_INDICES[key] if values[peer] & mask)
+            for position, unit in enumerate(UNIT_INDICES[key]):
+                places = [c for c in unit if values[c] & bit]
+                if not places:
                     return False
+                if len(places) == 1:
+                    # the value fits in only one place in the unit, so that place can't have any other value
+                    place = places[0]
+                    work.extend((place, val) for val in MASK_VALUES[values[place] & ~bit])
+                elif len(places) <= 3:
+                    # if the value's places all lie where this unit meets another (a box and a row or column), the
+                    # value is locked into them, so it can't go anywhere else in that other unit
+                    for kind in LOCKING_KINDS[position]:
+                        shared = CELL_UNITS[places[0]][kind]
+                        if all(CELL_UNITS[c][kind] == shared for c in places):
+                            work.extend((c, value) for c in UNIT_CELLS[shared] if values[c] & bit and c not in places)
         return True
 
     def is_valid(self) -> bool:
-        """Fake is_valid implementation (does nothing)."""
-        pass
+        """Return True IFF every cell has a candidate left and every unit still has a place for every value."""
+        values = self.values
+        if 0 in values:
+            return False
+        for unit in UNIT_CELLS:
+            mask = 0
+            for index in unit:
+                mask |= values[index]
+            if mask != ALL_VALUES:
+                return False
+        return True
 
     def is_solved(self) -> bool:
         """Return True IFF the sudoku is solved."""
-        return all(len(self.values[c]) == 1 for c in CELLS)
+        return all(POPCOUNT[self.values[index]] == 1 for index in range(self.GRID_SIZE))
 
     def clone(self) -> 'DictSudoku':
         """Return a new DictSudoku with the same values and clue cells as this instance."""
-        new_sudoku = self.__class__(self.values.copy())
+        # skip __init__, which would rebuild the clue cells only for them to be replaced by this instance's
+        new_sudoku = self.__class__.__new__(self.__class__)
+        new_sudoku.values = self.values[:]
         new_sudoku.clue_cells = self.clue_cells
         return new_sudoku
@@ -0,0 +1,267 @@
+"""Measure the performance of the sudoku solution algorithms against the sample puzzles."""
+
+import argparse
+import atexit
+import functools
+import multiprocessing
+import multiprocessing.pool
+import multiprocessing.sharedctypes
+import os
+import pprint
+import signal
+import sys
+import time
+
+from typing import (
+    AnyStr,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from sudoku.sample_puzzles import (
+    empty_cell_count_puzzles,
+    hard_puzzles,
+)
+from sudoku.solver import SolutionAlgorithm
+
+
+CORPORA = {
+    'empty': empty_cell_count_puzzles,
+    'hard': hard_puzzles,
+}
+
+
+class Trial(NamedTuple):
+    """The outcome of solving one puzzle with one algorithm."""
+    name: AnyStr
+    empty_cells: int
+    possibilities_tried: int
+    backtracks: int
+    total_time: float
+
+
+class TrialTimeout(Exception):
+    """Raised in a worker process when a trial runs past its timeout."""
+
+
+# trials are timed out with an interval timer, which only exists on Unix; elsewhere, timeouts are not enforced
+TIMEOUTS_SUPPORTED = hasattr(signal, 'setitimer')
+
+
+def _raise_trial_timeout(*_) -> None:
+    raise TrialTimeout()
+
+
+def _worker_init(worker_count: multiprocessing.sharedctypes.Synchronized) -> None:
+    if TIMEOUTS_SUPPORTED:
+        signal.signal(signal.SIGALRM, _raise_trial_timeout)
+    if hasattr(os, 'sched_setaffinity'):
+        with worker_count.get_lock():
+            worker_index = worker_count.value
+            worker_count.value += 1
+        # keep each worker on its own core so its caches stay warm; never pin two workers to the same core
+        allowed_cpus = sorted(os.sched_getaffinity(0))
+        if worker_index < len(allowed_cpus):
+            os.sched_setaffinity(0, {allowed_cpus[worker_index]})
+
+
+def _run_trial(trial: Tuple[int, int, AnyStr], corpus: AnyStr, algorithm: SolutionAlgorithm,
+               timeout_seconds: Optional[float] = None) -> Tuple[int, Optional[Trial]]:
+    trial_index, puzzle_index, trial_name = trial
+    print(f'Running trial {trial_name}')
+    # look the puzzle up in this worker's copy of the corpus rather than sending the puzzle string to the worker
+    sudoku = algorithm.value.sudoku_type.from_string(CORPORA[corpus][puzzle_index])
+    empty_cells = sudoku.num_empty_cells
+    solver = algorithm.value.solver_type(sudoku)
+
+    start_time = time.perf_counter()
+    timer_armed = timeout_seconds is not None and TIMEOUTS_SUPPORTED
+    # the alarm can go off anywhere while the timer is armed (even just after the solver returns), so the whole
+    # armed region is covered, and a late alarm is recorded as a timeout rather than escaping to the parent process
+    try:
+        if timer_armed:
+            # interrupt the solver in this worker once the trial's time is up, freeing the worker for the next trial
+            signal.setitimer(signal.ITIMER_REAL, timeout_seconds)
+        try:
+            solved = solver.solve()
+            end_time = time.perf_counter()
+            if timer_armed:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        finally:
+            # make sure the timer is off if the solver raised
+            if timer_armed:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+    except TrialTimeout:
+        print(f'Trial {trial_name} timed out')
+        return trial_index, None
+
+    if solved is None:
+        return trial_index, None
+    total_time = end_time - start_time
+    print(f'Trial {trial_name} completed in {total_time:0.2f} seconds')
+    return trial_index, Trial(trial_name, empty_cells, solver.possibilities_tried, solver.backtracks, total_time)
+
+
+def _available_cpu_count() -> int:
+    # respect CPU affinity (e.g., taskset) and any cgroup CPU quota (e.g., in a container), where available
+    if hasattr(os, 'sched_getaffinity'):
+        count = len(os.sched_getaffinity(0))
+    else:
+        count = multiprocessing.cpu_count()
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as cpu_max:
+            quota, period = cpu_max.read().split()
+        if quota != 'max':
+            count = min(count, max(1, int(quota) // int(period)))
+    except (OSError, ValueError):
+        pass
+    return count
+
+
+class PerformanceTestRunner:
+    """Class for running a sudoku solution algorithm against a corpus of sample puzzles in parallel."""
+
+    def __init__(self, corpus: AnyStr, algorithm: SolutionAlgorithm,
+                 trial_tag: Optional[AnyStr] = None, timeout_minutes: Optional[int] = None) -> None:
+        """Initialize a PerformanceTestRunner for the given corpus and algorithm."""
+        self.corpus = corpus
+        puzzle_count = len(CORPORA[corpus])
+        self.algorithm = algorithm
+        self.alg_name = algorithm.short_name
+        # resolve the worker count when the runner is created, so affinity or quota changes made after import count
+        self.max_workers = _available_cpu_count()
+        self.trial_tag = trial_tag
+        self.timeout_seconds = timeout_minutes * 60 if timeout_minutes is not None else None
+        self.count_format = f'0{len(str(puzzle_count))}d'  # ex: '02d' if puzzle_count is 2 digits
+        if self.timeout_seconds is None:
+            # trials are expected to be short, so batch them to cut down on per-task IPC
+            self.chunksize = max(1, puzzle_count // (4 * self.max_workers))
+        else:
+            # trials may run for a long time, so hand them out one at a time for the best load balance
+            self.chunksize = 1
+        self.trials = []
+        self.results = []
+
+    def run(self) -> None:
+        """Run all submitted trials, collecting the results as they complete."""
+        run_trial = functools.partial(_run_trial, corpus=self.corpus, algorithm=self.algorithm,
+                                      timeout_seconds=self.timeout_seconds)
+        # trials complete in any order, so slot each result in by its submission index
+        self.results = [None] * len(self.trials)
+        pool = _get_pool(self.max_workers)
+        for trial_index, trial in pool.imap_unordered(run_trial, self.trials, chunksize=self.chunksize):
+            self.results[trial_index] = trial
+
+    def submit(self, puzzle_index: int, trial_name: AnyStr) -> None:
+        """Add a trial for the puzzle at the given index in the corpus to the list of trials to run."""
+        self.trials.append((len(self.trials), puzzle_index, trial_name))
+
+    def get_results(self) -> List[Trial]:
+        """Return the completed trials in the order they were submitted."""
+        return [trial for trial in self.results if trial is not None]
+
+    def run_tests(self) -> List[Trial]:
+        """Run a trial for each puzzle in the corpus and return the results."""
+        for i in range(len(CORPORA[self.corpus])):
+            trial_name = f'{self.alg_name}-{i+1:{self.count_format}}'
+            if self.trial_tag:
+                trial_name += f'-{self.trial_tag}'
+            self.submit(i, trial_name)
+
+        self.run()
+        return self.get_results()
+
+
+_POOL = None
+_POOL_SIZE = 0
+
+
+def _get_pool(processes: int) -> multiprocessing.pool.Pool:
+    global _POOL, _POOL_SIZE
+    if _POOL is not None and _POOL_SIZE != processes:
+        _discard_pool()
+    if _POOL is None:
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            # fork workers from a small server process that has already imported the solvers,
+            # rather than copying this process (fork) or re-importing everything in each worker (spawn)
+            context = multiprocessing.get_context('forkserver')
+            context.set_forkserver_preload(['sudoku', 'sudoku.perf'])
+        else:
+            context = multiprocessing.get_context()
+        _POOL = context.Pool(processes=processes, initializer=_worker_init, initargs=(context.Value('i', 0),))
+        _POOL_SIZE = processes
+    return _POOL
+
+
+@atexit.register
+def _discard_pool() -> None:
+    global _POOL
+    if _POOL is not None:
+        _POOL.terminate()
+        _POOL = None
+
+
+def test_brute_force_solve_time(timeout_minutes: int = 30) -> List[Trial]:
+    """Measure the brute-force algorithm against the hard sample puzzles."""
+    return test_solve_time('hard', SolutionAlgorithm.BRUTE_FORCE, timeout_minutes=timeout_minutes)
+
+
+def test_constraint_based_solve_time() -> List[Trial]:
+    """Measure the constraint-based algorithm against the hard sample puzzles."""
+    return test_solve_time('hard', SolutionAlgorithm.CONSTRAINT_BASED)
+
+
+def test_dlx_solve_time(timeout_minutes: int = 60) -> List[Trial]:
+    """Measure the DLX algorithm against the hard sample puzzles."""
+    return test_solve_time('hard', SolutionAlgorithm.DANCING_LINKS, timeout_minutes=timeout_minutes)
+
+
+def test_empty_cells_vs_solve_time(algorithm: SolutionAlgorithm) -> List[Trial]:
+    """Measure the given algorithm against the sample puzzles with increasing numbers of empty cells."""
+    return test_solve_time('empty', algorithm, 'empty')
+
+
+def test_solve_time(corpus: AnyStr, algorithm: SolutionAlgorithm,
+                    trial_tag: Optional[AnyStr] = None, timeout_minutes: Optional[int] = None) -> List[Trial]:
+    """Measure the given algorithm against the given corpus of sample puzzles."""
+    return PerformanceTestRunner(corpus, algorithm, trial_tag, timeout_minutes).run_tests()
+
+
+ALGORITHM_CHOICES = {algorithm.short_name: algorithm for algorithm in SolutionAlgorithm}
+
+DEFAULT_TIMEOUT_MINUTES = {
+    SolutionAlgorithm.BRUTE_FORCE: 30,
+    SolutionAlgorithm.DANCING_LINKS: 60,
+}
+
+
+def parse_args(args: List[AnyStr]) -> argparse.Namespace:
+    """Return a Namespace containing the performance test configuration as parsed from the given arguments."""
+    parser = argparse.ArgumentParser(description='Measure the performance of the sudoku solution algorithms.')
+    parser.add_argument('-a', '--algorithm', choices=sorted(ALGORITHM_CHOICES.keys()), default='brute',
+                        help='The algorithm to measure')
+    parser.add_argument('-c', '--corpus', choices=sorted(CORPORA.keys()), default='hard',
+                        help='The set of sample puzzles to solve')
+    parser.add_argument('-t', '--timeout', '--timeout-minutes', type=int,
+                        help='How long to let each trial run before giving up (default depends on the algorithm; '
+                             'only enforced on Unix)')
+    return parser.parse_args(args)
+
+
+def main(args: List[AnyStr] = None) -> None:
+    """Entry point for the performance test."""
+    if args is None:
+        args = sys.argv[1:]
+    parsed_args = parse_args(args)
+    algorithm = ALGORITHM_CHOICES[parsed_args.algorithm]
+    trial_tag = parsed_args.corpus if parsed_args.corpus != 'hard' else None
+    timeout_minutes = parsed_args.timeout
+    if timeout_minutes is None:
+        timeout_minutes = DEFAULT_TIMEOUT_MINUTES.get(algorithm)
+    pprint.pprint(test_solve_time(parsed_args.corpus, algorithm, trial_tag, timeout_minutes))
+
+
+if __name__ == '__main__':
+    main()
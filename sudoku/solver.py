@@ -10,16 +10,23 @@ from typing import (
     Callable,
     Dict,
     Generic,
-    Iterable,
     List,
     Optional,
+    Tuple,
     TypeVar,
     Type,
 )
 
+from sudoku.bitmask import BitmaskSearch
 from sudoku.dlx import DLX
 from sudoku.grid import (
+    BOX_INDICES,
     CELLS,
+    COLUMN_INDICES,
+    MASK_VALUES,
+    POPCOUNT,
+    ROW_INDICES,
+    ROW_OFFSETS,
     Cell,
     DictSudoku,
     MatrixSudoku,
@@ -62,26 +69,48 @@ class BruteForceSolver(SudokuSolver[MatrixSudoku]):
     """SudokuSolver subclass that solves sudoku puzzles using a brute-force approach."""
 
     def solve(self) -> Optional[Sudoku]:
-        """Solve the puzzle by trying all possible values for all empty cells."""
-        if self.sudoku.is_solved():
-            self.on_grid_changed(self.sudoku)
-            return self.sudoku
-        cell = self.sudoku.get_next_empty_cell()
-        if cell is None:
+        """Solve the puzzle by trying each possible value for the empty cell with the fewest possible values."""
+        sudoku = self.sudoku
+        if sudoku.is_solved():
+            self.on_grid_changed(sudoku)
+            return sudoku
+        if not sudoku.is_valid():
             return None
-        for value in columns():
-            logger.debug(f'Trying {value} for {cell.name}')
-            logger.debug(str(self.sudoku))
-            self.on_grid_changed(self.sudoku)
-            self.sudoku[cell] = value
-            self.possibilities_tried += 1
-            if self.sudoku.is_valid():
-                solved = self.solve()
-                if solved:
-                    return solved
-        self.sudoku[cell] = None
-        self.backtracks += 1
-        return None
+        # the cells filled in so far form an explicit stack (in place of recursion), each with the candidates it
+        # has left to try; index and candidates are for the cell being filled in next, which isn't on the stack
+        stack = []
+        debug = logger.isEnabledFor(logging.DEBUG)
+        notify = self.event_listener is not None
+        # the counters are kept in locals and only written back when someone might be looking at them
+        possibilities_tried, backtracks = self.possibilities_tried, self.backtracks
+        index, candidates = sudoku.get_most_constrained_cell()
+        while True:
+            if not candidates:
+                # every candidate for this cell has been tried, so backtrack to the previous cell
+                backtracks += 1
+                if not stack:
+                    self.possibilities_tried, self.backtracks = possibilities_tried, backtracks
+                    return None
+                index, candidates = stack.pop()
+                sudoku.set_index_value(index, None)
+                continue
+            bit = candidates & -candidates
+            candidates ^= bit
+            value = bit.bit_length()
+            if debug:
+                logger.debug('Trying %d for %s', value, CELLS[index])
+                logger.debug('%s', sudoku)
+            if notify:
+                self.possibilities_tried, self.backtracks = possibilities_tried, backtracks
+                self.on_grid_changed(sudoku)
+            sudoku.set_index_value(index, value)
+            possibilities_tried += 1
+            if sudoku.is_solved():
+                self.possibilities_tried, self.backtracks = possibilities_tried, backtracks
+                self.on_grid_changed(sudoku)
+                return sudoku
+            stack.append((index, candidates))
+            index, candidates = sudoku.get_most_constrained_cell()
 
 
 class ConstraintBasedSolver(SudokuSolver[DictSudoku]):
@@ -91,15 +120,33 @@ class ConstraintBasedSolver(SudokuSolver[DictSudoku]):
         """Solve the puzzle by eliminating and deducing values recursively."""
         if sudoku is None:
             sudoku = self.sudoku
+            # a contradiction among the clues leaves the starting grid invalid, and no search can get past that
+            if not sudoku.is_valid():
+                return None
         if sudoku.is_solved():
             return sudoku
-        _, cell = min((len(sudoku.values[c]), c) for c in CELLS if len(sudoku.values[c]) > 1)
-        for value in sudoku.values[cell]:
-            logger.debug(f'Trying {value} for {cell}')
-            logger.debug(str(sudoku))
+        # a mask with more than one bit set (mask & (mask - 1) is nonzero) belongs to a cell that isn't decided yet;
+        # two candidates is the fewest an undecided cell can have, so the first such cell ends the scan
+        cell, best_count = -1, 10
+        for c, mask in enumerate(sudoku.values):
+            if mask & (mask - 1):
+                count = POPCOUNT[mask]
+                if count < best_count:
+                    cell, best_count = c, count
+                    if count == 2:
+                        break
+        if cell < 0:
+            # no cell is undecided, yet the grid isn't solved, so some cell has no candidates left: a dead end
+            self.backtracks += 1
+            return None
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for value in MASK_VALUES[sudoku.values[cell]]:
+            if debug:
+                logger.debug('Trying %d for %s', value, CELLS[cell])
+                logger.debug('%s', sudoku)
             new_sudoku = sudoku.clone()
             self.possibilities_tried += 1
-            if new_sudoku.set_cell_value(Row[cell[0]], int(cell[1]), value):
+            if new_sudoku.set_index_value(cell, value):
                 self.on_grid_changed(new_sudoku)
                 solved = self.solve(new_sudoku)
                 if solved:
@@ -114,22 +161,34 @@ COLUMN_NUMBER_CONSTRAINTS = [f'C{c}#{n}' for c in range(1, 10) for n in range(1,
 BOX_NUMBER_CONSTRAINTS = [f'B{b}#{n}' for b in range(1, 10) for n in range(1, 10)]
 ALL_CONSTRAINTS = ROW_COLUMN_CONSTRAINTS + ROW_NUMBER_CONSTRAINTS + COLUMN_NUMBER_CONSTRAINTS + BOX_NUMBER_CONSTRAINTS
 
+# the indices in ALL_CONSTRAINTS of the four constraints matched by each value in each cell, at the index
+# (cell index * 9) + value - 1, where cells are indexed in row-major order
+CONSTRAINT_INDICES = [
+    (
+        index,
+        len(ROW_COLUMN_CONSTRAINTS) + ROW_INDICES[index] * 9 + value,
+        len(ROW_COLUMN_CONSTRAINTS) + len(ROW_NUMBER_CONSTRAINTS) + COLUMN_INDICES[index] * 9 + value,
+        len(ALL_CONSTRAINTS) - len(BOX_NUMBER_CONSTRAINTS) + BOX_INDICES[index] * 9 + value,
+    )
+    for index in range(Sudoku.GRID_SIZE)
+    for value in range(Sudoku.GRID_SIDE_LENGTH)
+]
+
 
 class DLXSolver(SudokuSolver[MatrixSudoku]):
     """SudokuSolver subclass that solves sudoku puzzles using the dancing links (DLX) algorithm."""
 
     def __init__(self, sudoku: MatrixSudoku, event_listener: Optional[Callable[[Sudoku], None]] = None,
-                 minimize_branching: bool = False) -> None:
+                 minimize_branching: bool = True) -> None:
         """Initialize a DLXSolver with the given sudoku, event listener, and optionally minimizing branching."""
         self.minimize_branching = minimize_branching
-        self.dlx = None
+        # an empty DLX stands in until solve builds the real one, so the counters read as 0 without a None check
+        self.dlx = DLX([])
         super().__init__(sudoku, event_listener)
 
     @property
     def possibilities_tried(self) -> int:
         """Property that returns the number of possibilities tried by the solver."""
-        if self.dlx is None:
-            return 0
         return self.dlx.possibilities_tried
 
     @possibilities_tried.setter
@@ -140,8 +199,6 @@ class DLXSolver(SudokuSolver[MatrixSudoku]):
     @property
     def backtracks(self) -> int:
         """Property that returns the number of backtracks made by the solver."""
-        if self.dlx is None:
-            return 0
         return self.dlx.backtracks
 
     @backtracks.setter
@@ -164,32 +221,22 @@ class DLXSolver(SudokuSolver[MatrixSudoku]):
         index = ((int(first_value) - 1) * Sudoku.GRID_SIDE_LENGTH) + int(second_value) - 1
         return offset + index
 
-    def get_matching_constraint_indices(self, row: Row, column: int, value: int) -> Iterable[int]:
+    def get_matching_constraint_indices(self, row: Row, column: int, value: int) -> Tuple[int, ...]:
         """Return the indices in the list of all constraints matching the given row, column, and value."""
-        row_col_index = self.get_constraint_index(f'R{row.value}C{column}')
-        row_num_index = self.get_constraint_index(f'R{row.value}#{value}')
-        col_num_index = self.get_constraint_index(f'C{column}#{value}')
-        row_offset = (row.value - 1) // 3
-        column_offset = ((column - 1) // 3) + 1
-        box = (row_offset * 3) + column_offset
-        box_num_index = self.get_constraint_index(f'B{box}#{value}')
-        return row_col_index, row_num_index, col_num_index, box_num_index
-
-    def get_matrix(self) -> List[List[int]]:
-        """Return a 2D constraint matrix from the solver's sudoku."""
+        return CONSTRAINT_INDICES[(ROW_OFFSETS[row] + column - 1) * 9 + value - 1]
+
+    def get_matrix(self) -> List[Tuple[int, ...]]:
+        """Return a sparse constraint matrix (the indices of the constraints matched by each row) from the sudoku."""
+        # a filled cell contributes only the row for its value, so the rows for values it can't have are left out;
+        # CONSTRAINT_INDICES keeps each cell's nine rows together, so an empty cell contributes a single slice of it
         matrix = []
-        for cell in all_cells():
-            cell_value = self.sudoku.get_cell_value(cell.row, cell.column)
-            if cell_value is None:
-                candidates = Sudoku.CELL_VALUES
+        offset = 0
+        for cell_value in self.sudoku.values:
+            if cell_value:
+                matrix.append(CONSTRAINT_INDICES[offset + cell_value - 1])
             else:
-                candidates = {cell_value}
-            for matrix_candidate in Sudoku.CELL_VALUES:
-                matrix_row = [0] * len(ALL_CONSTRAINTS)
-                if matrix_candidate in candidates:
-                    for index in self.get_matching_constraint_indices(cell.row, cell.column, matrix_candidate):
-                        matrix_row[index] = 1
-                matrix.append(matrix_row)
+                matrix.extend(CONSTRAINT_INDICES[offset:offset + 9])
+            offset += 9
         return matrix
 
     @staticmethod
@@ -226,8 +273,9 @@ class DLXSolver(SudokuSolver[MatrixSudoku]):
     def solve(self) -> Optional[Sudoku]:
         """Solve the puzzle by delegating to DLX, then converting the solution back to a sudoku."""
         matrix = self.get_matrix()
-        self.dlx = DLX(matrix, column_names=ALL_CONSTRAINTS, minimize_branching=self.minimize_branching,
-                       event_listener=self.event_listener)
+        self.dlx = DLX.from_sparse(matrix, len(ALL_CONSTRAINTS), column_names=ALL_CONSTRAINTS,
+                                   minimize_branching=self.minimize_branching, event_listener=self.event_listener)
+        self.dlx.event_interval = self.event_interval
         solution = self.dlx.search()
         if solution is None:
             return None
@@ -236,17 +284,76 @@ class DLXSolver(SudokuSolver[MatrixSudoku]):
         return self.get_solved_sudoku(solution)
 
 
+class BitmaskSolver(SudokuSolver[MatrixSudoku]):
+    """SudokuSolver subclass that solves sudoku puzzles using a depth-first search over bitmasks of candidate values."""
+
+    def __init__(self, sudoku: MatrixSudoku, event_listener: Optional[Callable[[Sudoku], None]] = None) -> None:
+        """Initialize a BitmaskSolver with the given sudoku and event listener."""
+        # as in DLXSolver, an empty search keeps the counters at 0 until solve replaces it
+        self.bitmask_search = BitmaskSearch([0] * 81)
+        super().__init__(sudoku, event_listener)
+
+    @property
+    def possibilities_tried(self) -> int:
+        """Property that returns the number of possibilities tried by the solver."""
+        return self.bitmask_search.possibilities_tried
+
+    @possibilities_tried.setter
+    def possibilities_tried(self, value: int) -> None:
+        """Fake setter for the possibilities_tried property (does nothing)."""
+        pass
+
+    @property
+    def backtracks(self) -> int:
+        """Property that returns the number of backtracks made by the solver."""
+        return self.bitmask_search.backtracks
+
+    @backtracks.setter
+    def backtracks(self, value: int) -> None:
+        """Fake setter for the backtracks property (does nothing)."""
+        pass
+
+    def get_board(self) -> List[int]:
+        """Return a list of the sudoku's cell values in row-major order (with 0 for empty cells)."""
+        return list(self.sudoku.values)
+
+    def get_solved_sudoku(self, board: List[int]) -> MatrixSudoku:
+        """Return a MatrixSudoku instance from the given solved board."""
+        sudoku = MatrixSudoku()
+        for index, value in enumerate(board):
+            sudoku.set_index_value(index, value)
+        sudoku.clue_cells = self.sudoku.clue_cells
+        return sudoku
+
+    def solve(self) -> Optional[Sudoku]:
+        """Solve the puzzle by delegating to a bitmask search, then converting the solved board back to a sudoku."""
+        self.bitmask_search = BitmaskSearch(self.get_board(), event_listener=self.event_listener)
+        self.bitmask_search.event_interval = self.event_interval
+        board = self.bitmask_search.search()
+        if board is None:
+            return None
+        return self.get_solved_sudoku(board)
+
+
 @dataclass
 class AlgorithmConfig:
     sudoku_type: Type[Sudoku]
     solver_type: Type[SudokuSolver]
+    short_name: AnyStr
 
 
 class SolutionAlgorithm(Enum):
     """Enumeration defining the supported sudoku solving algorithms."""
-    BRUTE_FORCE = AlgorithmConfig(sudoku_type=MatrixSudoku, solver_type=BruteForceSolver)
-    CONSTRAINT_BASED = AlgorithmConfig(sudoku_type=DictSudoku, solver_type=ConstraintBasedSolver)
-    DANCING_LINKS = AlgorithmConfig(sudoku_type=MatrixSudoku, solver_type=DLXSolver)
+    BRUTE_FORCE = AlgorithmConfig(sudoku_type=MatrixSudoku, solver_type=BruteForceSolver, short_name='brute')
+    CONSTRAINT_BASED = AlgorithmConfig(sudoku_type=DictSudoku, solver_type=ConstraintBasedSolver,
+                                       short_name='constraint')
+    DANCING_LINKS = AlgorithmConfig(sudoku_type=MatrixSudoku, solver_type=DLXSolver, short_name='dlx')
+    BITMASK = AlgorithmConfig(sudoku_type=MatrixSudoku, solver_type=BitmaskSolver, short_name='bitmask')
+
+    @property
+    def short_name(self) -> AnyStr:
+        """Property that returns a short name for the algorithm (e.g., for labeling performance trials)."""
+        return self.value.short_name
 
 
 def solve(sudoku: Optional[Sudoku] = None, sudoku_string: Optional[AnyStr] = None,
@@ -14,16 +14,14 @@ from sudoku import (
     get_puzzle_by_name,
     get_solver,
 )
-from sudoku.grid import (
-    all_cells,
-    columns,
-)
+from sudoku.grid import columns
+from sudoku.ui_defaults import DEFAULT_STEP_DELAY_MILLIS
 
 
 class SudokuApp(tk.Frame):
     """Class containing state and graphics elements for rendering the UI."""
 
-    DEFAULT_STEP_DELAY_MILLIS = 10
+    DEFAULT_STEP_DELAY_MILLIS = DEFAULT_STEP_DELAY_MILLIS
     DEFAULT_TICK_DELAY_MILLIS = 100
 
     def __init__(self, master: Optional[tk.Tk] = None, sudoku: Optional[Sudoku] = None,
@@ -50,6 +48,10 @@ class SudokuApp(tk.Frame):
         self.solver = None
         self.solve_thread = None
         self.cells = []
+        self.cell_var_names = []  # the Tcl names of the cells' variables, in row-major order
+        # the solver thread only records the latest grid (as a condensed string); tick redraws the cells that changed
+        self.pending_grid = None
+        self.rendered_grid = sudoku.get_condensed_string() if sudoku is not None else None
         self.pack()
         self.create_grid()
         self.stats = self.create_stats_display()
@@ -84,6 +86,7 @@ class SudokuApp(tk.Frame):
                 )
                 cell.pack(side='left')
                 cells.append(var)
+                self.cell_var_names.append(str(var))
                 if column in {3, 6}:
                     self.create_vertical_line(row)
             row.pack(side='top')
@@ -113,34 +116,41 @@ class SudokuApp(tk.Frame):
         return stats
 
     def update_grid(self, sudoku: Sudoku) -> None:
-        """Event listener for the sudoku solver that updates the UI when the puzzle changes."""
-        try:
-            for cell in all_cells():
-                value = str(sudoku.get_cell_value(cell.row, cell.column) or '')
-                var = self.cells[cell.row.value - 1][cell.column - 1]
-                if var.get() != value:
-                    var.set(value)
-            time.sleep(self.delay_millis / 1000)
-        except:
-            pass
+        """Event listener for the sudoku solver that records the puzzle's new state for the next tick to display."""
+        self.pending_grid = sudoku.get_condensed_string()
+        time.sleep(self.delay_millis / 1000)
+
+    def render_grid(self) -> None:
+        """Update the cells whose values differ between the most recently rendered grid and the pending grid."""
+        pending_grid, rendered_grid = self.pending_grid, self.rendered_grid
+        if pending_grid is None or pending_grid == rendered_grid:
+            return
+        # set all the changed cells with a single Tcl script, rather than one round trip to Tcl per cell
+        names = self.cell_var_names
+        script = '; '.join(f'set {names[index]} {{{"" if value == "." else value}}}'
+                           for index, value in enumerate(pending_grid)
+                           if rendered_grid is None or rendered_grid[index] != value)
+        self.tk.eval(script)
+        self.rendered_grid = pending_grid
 
     @property
     def elapsed_time(self) -> float:
         """Property that returns the time elapsed since the solver was started."""
         if self.start_time is not None:
-            end_time = self.end_time or time.time()
+            end_time = self.end_time or time.perf_counter()
             return end_time - self.start_time
         return 0
 
     def tick(self) -> None:
         """Update the UI on a regular interval."""
         if self.solve_thread is not None and not self.solve_thread.is_alive():
-            self.end_time = time.time()
+            self.end_time = time.perf_counter()
             self.solve_thread = None
+        self.render_grid()
         self.stats['text'] = (f'Possibilities Tried: {self.solver.possibilities_tried}          '
                               f'Backtracks: {self.solver.backtracks}          '
                               f'Elapsed Time: {self.elapsed_time:0.2f} sec')
-        self.update()
+        self.update_idletasks()
         self.after(self.DEFAULT_TICK_DELAY_MILLIS, self.tick)
 
     def run(self) -> None:
@@ -150,7 +160,7 @@ class SudokuApp(tk.Frame):
             self.solver.event_listener = self.update_grid
             self.solve_thread = threading.Thread(target=self.solver.solve, daemon=True)
             self.solve_thread.start()
-            self.start_time = time.time()
+            self.start_time = time.perf_counter()
             self.tick()
 
         super().mainloop()
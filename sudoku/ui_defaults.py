@@ -0,0 +1,3 @@
+"""Default settings for the GUI, kept apart from sudoku.ui so they can be read without importing tkinter."""
+
+DEFAULT_STEP_DELAY_MILLIS = 10  # how long the GUI pauses after each step of the solution
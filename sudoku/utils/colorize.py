@@ -13,6 +13,11 @@ class Color(Enum):
     YELLOW = '0;33'
 
 
+# the escape sequence that starts each color, built once rather than looking up the color's value on every call
+COLOR_PREFIXES = {color: f'\033[{color.value}m' for color in Color}
+COLOR_RESET = '\033[0m'
+
+
 def bold(text: AnyStr) -> AnyStr:
     """Return text formatted in bold."""
     return colorize(text, Color.BOLD)
@@ -40,4 +45,4 @@ def yellow(text: AnyStr) -> AnyStr:
 
 def colorize(text: AnyStr, color: Color) -> AnyStr:
     """Return text formatted in the specified color."""
-    return f'\033[{color.value}m{text}\033[0m'
+    return f'{COLOR_PREFIXES[color]}{text}{COLOR_RESET}'
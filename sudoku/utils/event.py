@@ -19,13 +19,21 @@ T = TypeVar('T')
 class EventDispatcher(Generic[T]):
     """Mixin class for dispatching events when state changes."""
 
-    def __init__(self, event_listener: Optional[Callable[[T], None]] = None) -> None:
-        """Initialize an EventDispatcher with an optional event listener."""
+    def __init__(self, event_listener: Optional[Callable[[T], None]] = None, event_interval: int = 1) -> None:
+        """Initialize an EventDispatcher with an optional event listener, invoked on every event_interval-th event."""
         self.event_listener = event_listener
+        self.event_interval = event_interval
+        self.events_until_dispatch = 1
 
     def on_state_changed(self, state: T) -> None:
         """To invoke any event listeners, subclasses should call this method with their new state."""
         if self.event_listener is not None:
+            # listeners that only sample the state (such as a progress display) can set a larger event_interval, so
+            # that most state changes are counted here instead of being passed on to them
+            self.events_until_dispatch -= 1
+            if self.events_until_dispatch > 0:
+                return
+            self.events_until_dispatch = self.event_interval
             try:
                 self.event_listener(state)
             except Exception:
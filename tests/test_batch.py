@@ -0,0 +1,17 @@
+import pytest
+
+from sudoku.batch import solve_lines
+from sudoku.solver import SolutionAlgorithm
+
+
+LINES = [
+    'not a sudoku',
+    '514678912672195348198342567859761423426853791713924856961537284287419635345286179',
+    '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......',
+]
+SOLUTION = '417369825632158947958724316825437169791586432346912758289643571573291684164875293'
+
+
+@pytest.mark.parametrize('algorithm', list(SolutionAlgorithm))
+def test_solve_lines_yields_one_line_per_puzzle(algorithm):
+    assert list(solve_lines(LINES, algorithm)) == ['', '', SOLUTION]
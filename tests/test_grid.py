@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from sudoku.grid import (
+    ALL_VALUES,
+    BOX_CELLS,
+    CELL_COLUMNS,
+    CELL_ROWS,
+    CELL_UNITS,
+    DictSudoku,
+    MatrixSudoku,
+)
+
+
+def recompute_bookkeeping(sudoku):
+    """Return MatrixSudoku's unit bookkeeping for the given sudoku, computed from scratch from its values."""
+    unit_counts = [0] * 270
+    for index, value in enumerate(sudoku.values):
+        if value:
+            for unit in CELL_UNITS[index]:
+                unit_counts[unit * 10 + value] += 1
+    unit_masks = [0] * 27
+    for key, count in enumerate(unit_counts):
+        if count:
+            unit_masks[key // 10] |= 1 << (key % 10 - 1)
+    conflicts = sum(count * (count - 1) // 2 for count in unit_counts)
+    filled_cells = sum(1 for value in sudoku.values if value)
+    return unit_counts, unit_masks, conflicts, filled_cells
+
+
+def test_matrix_sudoku_bookkeeping_matches_a_recomputation():
+    rng = random.Random(42)
+    sudoku = MatrixSudoku()
+    for _ in range(20000):
+        value = rng.choice([None, None, 1, 2, 3, 4, 5, 6, 7, 8, 9])
+        sudoku.set_index_value(rng.randrange(81), value)
+        unit_counts, unit_masks, conflicts, filled_cells = recompute_bookkeeping(sudoku)
+        assert sudoku.unit_counts == unit_counts
+        assert sudoku.unit_masks == unit_masks
+        assert sudoku.conflicts == conflicts
+        assert sudoku.filled_cells == filled_cells
+        assert sudoku.is_valid() == (conflicts == 0)
+        assert sudoku.is_solved() == (conflicts == 0 and filled_cells == 81)
+
+
+@pytest.mark.parametrize('value', [-1, 10, 256])
+def test_matrix_sudoku_rejects_values_outside_1_to_9(value):
+    sudoku = MatrixSudoku()
+    with pytest.raises(ValueError):
+        sudoku.set_index_value(0, value)
+    assert sudoku.values[0] == 0
+    assert sudoku.is_valid()
+
+
+def eliminate_everywhere_but(places, unit, value):
+    """Return a DictSudoku in which the only cells of the given unit that can hold the given value are places."""
+    bit = 1 << (value - 1)
+    values = [ALL_VALUES] * 81
+    others = [index for index in unit if index not in places]
+    for index in others[:-1]:
+        values[index] &= ~bit
+    sudoku = DictSudoku(values)
+    # eliminate the value from the last of the other cells through the sudoku, so that the elimination propagates
+    last = others[-1]
+    assert sudoku.eliminate(CELL_ROWS[last], CELL_COLUMNS[last], value)
+    return sudoku
+
+
+@pytest.mark.parametrize('places, unit, locked_unit', [
+    # a value confined to the first row of the first box can't go anywhere else in that row
+    ((0, 1, 2), BOX_CELLS[0], range(0, 9)),
+    # a value confined to the first column of the first box can't go anywhere else in that column
+    ((0, 9, 18), BOX_CELLS[0], range(0, 81, 9)),
+    # a value confined to the first box's part of the first row can't go anywhere else in that box
+    ((0, 1, 2), range(0, 9), BOX_CELLS[0]),
+    # a value confined to the last box's part of the last column can't go anywhere else in that box
+    ((62, 71, 80), range(8, 81, 9), BOX_CELLS[8]),
+])
+def test_dict_sudoku_eliminates_locked_candidates(places, unit, locked_unit):
+    bit = 1 << (5 - 1)
+    sudoku = eliminate_everywhere_but(places, unit, 5)
+    for index in locked_unit:
+        assert bool(sudoku.values[index] & bit) == (index in places)
@@ -0,0 +1,42 @@
+import pytest
+
+from sudoku.grid import (
+    DictSudoku,
+    MatrixSudoku,
+)
+from sudoku.sample_puzzles import (
+    empty_cell_count_puzzles,
+    hard_puzzles,
+)
+from sudoku.solver import (
+    ConstraintBasedSolver,
+    SolutionAlgorithm,
+    solve,
+)
+
+
+# a few quick puzzles from each corpus, including the empty grid (the last of the empty-n puzzles)
+PUZZLES = hard_puzzles[:3] + empty_cell_count_puzzles[::21] + empty_cell_count_puzzles[-1:]
+
+
+# an ordinary puzzle with one wrong clue, and a complete grid with two 1s in its first row
+UNSOLVABLE_PUZZLES = [
+    '.82......95..648..374..2.........91....9.7.53.9.3..........1394..94.5...123..95..',
+    '514678912672195348198342567859761423426853791713924856961537284287419635345286179',
+]
+
+
+def test_constraint_based_solver_returns_none_for_unsolvable_puzzles():
+    for puzzle in UNSOLVABLE_PUZZLES:
+        assert ConstraintBasedSolver(DictSudoku.from_string(puzzle)).solve() is None
+
+
+@pytest.mark.parametrize('algorithm', list(SolutionAlgorithm))
+@pytest.mark.parametrize('puzzle', PUZZLES)
+def test_solve_produces_a_solved_grid_that_keeps_the_clues(algorithm, puzzle):
+    solved = solve(sudoku_string=puzzle, algorithm=algorithm)
+    assert solved is not None
+    solution = solved.get_condensed_string()
+    assert MatrixSudoku.from_string(solution).is_solved()
+    clues = MatrixSudoku.from_string(puzzle).get_condensed_string()
+    assert all(clue == '.' or clue == value for clue, value in zip(clues, solution))